@@ -1,61 +1,109 @@
 import threading
-from copy import deepcopy
-from typing import Callable, Dict, Any, Optional, List
-from collections import deque
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
-from .types import ImmutableDict
+from .types import FrozenDict, ImmutableDict, ImmutableList
 from .storage import StorageEngine
 from .utils import combine_state
 
 
 class TimeTravel:
-    """Manages state history for time travel debugging."""
+    """
+    Manages state history for time travel debugging.
+
+    History is a fixed-size ring buffer kept as parallel lists of states,
+    actions and timestamps, so recording a dispatch is a few index writes.
+    """
     
     def __init__(self, max_history: int = 50):
-        self.history = deque(maxlen=max_history)
+        self.max_history = max_history
+        self._states = [None] * max_history
+        self._actions = [None] * max_history
+        self._timestamps = [0.0] * max_history
+        # ISO strings for _timestamps, formatted on first read by get_history
+        self._formatted_timestamps = [None] * max_history
+        self._head = 0
+        self._count = 0
         self.current_index = -1
         self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slot(self, index: int) -> int:
+        """Map a history index (0 is the oldest entry) to its buffer slot."""
+        return (self._head - self._count + index) % self.max_history
         
-    def push_state(self, state: Dict, action: Dict):
-        """Add new state to history."""
+    def push_state(self, state: ImmutableDict, action: Dict):
+        """Add new state to history.
+
+        States are immutable, so they are stored by reference and shared
+        with the store instead of being copied.
+        """
+        if not isinstance(state, ImmutableDict):
+            state = ImmutableDict(state)
+
         with self.lock:
-            if self.current_index < len(self.history) - 1:
-                self.history = deque(list(self.history)[:self.current_index + 1], maxlen=self.history.maxlen)
-            
-            self.history.append({
-                'state': deepcopy(state),
-                'action': deepcopy(action),
-                'timestamp': datetime.now().isoformat()
-            })
-            self.current_index = len(self.history) - 1
+            if not self.max_history:
+                return
+
+            # Drop the undone branch, releasing the states it referenced
+            while self._count > self.current_index + 1:
+                self._head = (self._head - 1) % self.max_history
+                self._states[self._head] = None
+                self._actions[self._head] = None
+                self._count -= 1
+
+            head = self._head
+            self._states[head] = state
+            self._actions[head] = dict(action)
+            self._timestamps[head] = time.time()
+            self._formatted_timestamps[head] = None
+            self._head = (head + 1) % self.max_history
+            if self._count < self.max_history:
+                self._count += 1
+            self.current_index = self._count - 1
             
-    def get_state(self, index: int) -> Optional[Dict]:
+    def get_state(self, index: int) -> Optional[ImmutableDict]:
         """Get state at specific index."""
         with self.lock:
-            if 0 <= index < len(self.history):
-                return deepcopy(self.history[index]['state'])
+            if 0 <= index < self._count:
+                return self._states[self._slot(index)]
         return None
         
-    def get_current_state(self) -> Optional[Dict]:
+    def get_current_state(self) -> Optional[ImmutableDict]:
         """Get current state in time travel history."""
         with self.lock:
             if self.current_index >= 0:
-                return deepcopy(self.history[self.current_index]['state'])
+                return self._states[self._slot(self.current_index)]
         return None
     
     def get_history(self) -> List[Dict]:
         """Get list of all actions and timestamps."""
         with self.lock:
-            return [
-                {
+            history = []
+            for i in range(self._count):
+                slot = self._slot(i)
+                timestamp = self._formatted_timestamps[slot]
+                if timestamp is None:
+                    timestamp = datetime.fromtimestamp(self._timestamps[slot]).isoformat()
+                    self._formatted_timestamps[slot] = timestamp
+                history.append({
                     'index': i,
-                    'action': item['action'],
-                    'timestamp': item['timestamp'],
+                    'action': self._actions[slot],
+                    'timestamp': timestamp,
                     'active': i == self.current_index
-                }
-                for i, item in enumerate(self.history)
-            ]
+                })
+            return history
+
+class _BatchState(threading.local):
+    """The calling thread's `batch()` nesting depth and pending notification."""
+    depth = 0
+    pending = False
+
 
 class beanstackStore:
     """
@@ -79,6 +127,8 @@ class beanstackStore:
         self._storage = storage_engine
         self._storage_key = storage_key
         self._persist_keys = persist_keys
+        self._persist_keys_set = frozenset(persist_keys) if persist_keys else None
+        self._last_persisted = None
         self.devtools = None
         
         # Try to rehydrate state from storage
@@ -87,8 +137,11 @@ class beanstackStore:
         merge_state = combine_state(base_state, rehydrated_state) if rehydrated_state else base_state
 
         self._state = ImmutableDict(merge_state)
-        self._subscribers = []
+        # Copy-on-write: replaced rather than mutated, so notifying can iterate it as is
+        self._subscribers: Tuple[Tuple[Callable, Callable[[], None]], ...] = ()
         self._lock = threading.RLock()
+        self._persist_lock = threading.Lock()
+        self._batch = _BatchState()
         self._time_travel = TimeTravel()
         self._debug_mode = False
 
@@ -112,78 +165,202 @@ class beanstackStore:
         
         return stored_state
 
-    def _persist_state(self) -> None:
-        """Save current state to storage."""
+    def _persist_state(self, state: Optional[ImmutableDict] = None) -> None:
+        """
+        Save `state` (the current state by default) to storage, skipping
+        writes when nothing persisted changed.
+
+        Runs outside the dispatch lock; `_persist_lock` keeps writes ordered
+        and a state that has already been superseded is not written at all.
+        """
         if self._storage is None:
             return
-        
-        state_to_persist = self._state.to_dict()
-        if self._persist_keys:
+
+        with self._persist_lock:
+            if state is None:
+                state = self._state
+            elif state is not self._state:
+                return
+            self._write_state(state)
+
+    def _write_state(self, state: ImmutableDict) -> None:
+        data = state._data
+        if self._persist_keys_set is not None:
             # Only persist specified keys
+            keys = self._persist_keys_set & data.keys()
+        else:
+            keys = data.keys()
+
+        # Dirty check: slices a dispatch did not touch keep their identity,
+        # so comparing references is enough to tell whether anything changed.
+        last = self._last_persisted
+        if (
+            last is not None
+            and len(last) == len(keys)
+            and all(key in last and data[key] is last[key] for key in keys)
+        ):
+            return
+
+        persisted = data if self._persist_keys_set is None else {key: data[key] for key in keys}
+
+        # The read-only views are cached and JSON-serializable as they are
+        if persisted is data:
+            state_to_persist = state.view()
+        else:
             state_to_persist = {
-                key: state_to_persist[key]
-                for key in self._persist_keys
-                if key in state_to_persist
+                key: value.view() if isinstance(value, (ImmutableDict, ImmutableList)) else value
+                for key, value in persisted.items()
             }
             
         self._storage.save(self._storage_key, state_to_persist)
+        # Only a save that went through counts; a failed one is retried next time
+        self._last_persisted = persisted
 
     def get_state(self, slice_key=None) -> Dict[str, Any]:
-        """Return current state, considering time travel if enabled."""
-        with self._lock:
-            if self._debug_mode:
-                state = self._time_travel.get_current_state()
-                if state is not None:
-                    if slice_key:
-                        return state.get(slice_key)
-                    return deepcopy(state)
-            
-            if slice_key:
-                return self._state.get(slice_key)
-            return deepcopy(self._state.to_dict())
+        """
+        Return current state, considering time travel if enabled.
+
+        The full state is returned as a fresh plain dict that the caller owns;
+        changing it has no effect on the store.
+        """
+        # Lock-free read: _state is an ImmutableDict that is only ever replaced
+        # by a single attribute assignment, so one load sees a complete state.
+        state = self._state
+        if self._debug_mode:
+            travelled = self._time_travel.get_current_state()
+            if travelled is not None:
+                state = travelled
+
+        if slice_key:
+            return state.get(slice_key)
+        return state.to_dict()
+
+    def select(self, selector: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Return `selector(state)`, memoized for as long as the state is unchanged.
+
+        Results are cached on the current ImmutableDict, keyed weakly by the
+        selector itself, so pass a stable function rather than a fresh lambda
+        per call; a dropped selector's entry goes away with it. Selectors
+        that cannot be weakly referenced (some builtins) are not cached.
+        The selector receives the state's read-only view (a FrozenDict).
+        """
+        state = self._state
+        if self._debug_mode:
+            travelled = self._time_travel.get_current_state()
+            if travelled is not None:
+                state = travelled
+
+        cache = state._selector_cache
+        if cache is None:
+            cache = state._selector_cache = weakref.WeakKeyDictionary()
+        try:
+            return cache[selector]
+        except KeyError:
+            pass
+        except TypeError:
+            return selector(state.view())
+
+        result = cache[selector] = selector(state.view())
+        return result
 
     def _base_dispatch(self, action: Dict[str, Any]) -> None:
         """Base dispatch function that updates state and notifies subscribers."""
         if not isinstance(action, dict) or 'type' not in action:
             raise ValueError("Actions must be dictionaries with a 'type' key.")
 
+        notify = False
         with self._lock:
-            new_state = self._reducer(self._state.to_dict(), action)
-            self._state = ImmutableDict(new_state)
+            # Reducers get the shared read-only view, so they must return new
+            # dicts rather than edit their input in place.
+            current_state = self._state.view()
+            new_state = self._reducer(current_state, action)
+
+            # Reducers that hand back the state they were given leave the store
+            # untouched. The input is a read-only view, so returning it really
+            # means "no change".
+            if new_state is current_state or new_state is self._state:
+                changed = False
+            else:
+                # An equal state still replaces the current one, since values
+                # like 1 and True compare equal without being the same; it only
+                # skips persistence and notification. Unchanged slices are
+                # shared, so the comparison stops at them by identity.
+                changed = new_state != (self._state if isinstance(new_state, ImmutableDict) else current_state)
+                self._state = ImmutableDict(new_state, self._state)
+            
+            state = self._state
             
             if self._debug_mode:
-                self._time_travel.push_state(new_state, action)
+                self._time_travel.push_state(state, action)
             
+            if changed:
+                batch = self._batch
+                if batch.depth:
+                    batch.pending = True
+                else:
+                    notify = True
+
+        # Serialization, storage I/O and subscriber callbacks all run after
+        # the lock is released, so they never block other dispatches.
+        if changed:
             # Persist state after update
-            self._persist_state()
-                
+            self._persist_state(state)
+        if notify:
             self._notify_subscribers()
-            return action
+        return action
 
     def dispatch(self, action: Dict[str, Any]) -> Any:
         """Dispatch an action to modify the state."""
         return self._base_dispatch(action)
 
+    @contextmanager
+    def batch(self):
+        """
+        Defer subscriber notifications while dispatching several actions.
+
+        Subscribers are notified once, when the outermost batch exits, and
+        only if one of the batched dispatches actually changed the state.
+        Batching is per thread: dispatches from other threads still notify
+        right away.
+        """
+        batch = self._batch
+        batch.depth += 1
+        try:
+            yield self
+        finally:
+            batch.depth -= 1
+            flush = batch.depth == 0 and batch.pending
+            if flush:
+                batch.pending = False
+                self._notify_subscribers()
+
     def subscribe(self, listener: Callable) -> Callable:
         """Subscribe to state changes."""
+        # Resolve how the listener is notified once, instead of on every dispatch
+        notify = getattr(listener, "redraw", listener)
+        if not callable(notify):
+            typeof = type(listener)
+            raise Exception(f"Expected the listener to be a function or have a redraw method. Instead, received: {typeof.__name__}")
+
         with self._lock:
-            self._subscribers.append(listener)
+            self._subscribers = self._subscribers + ((listener, notify),)
         return lambda: self._unsubscribe(listener)
 
     def _unsubscribe(self, listener: Callable) -> None:
         """Unsubscribe a listener from state changes."""
         with self._lock:
-            if listener in self._subscribers:
-                self._subscribers.remove(listener)
+            subscribers = self._subscribers
+            for i, (subscriber, _) in enumerate(subscribers):
+                if subscriber == listener:
+                    self._subscribers = subscribers[:i] + subscribers[i + 1:]
+                    break
 
     def _notify_subscribers(self) -> None:
         """Notify all subscribers of state changes."""
-        with self._lock:
-            for subscriber in list(self._subscribers):
-                if hasattr(subscriber, "redraw"):
-                    subscriber.redraw()
-                elif callable(subscriber):
-                    subscriber()
+        # Subscribing swaps in a new tuple, so no lock or copy is needed here
+        for _, notify in self._subscribers:
+            notify()
 
     # Time Travel Debugging Methods
     def enable_debug(self):
@@ -191,16 +368,16 @@ class beanstackStore:
         with self._lock:
             if not self._debug_mode:
                 self._debug_mode = True
-                self._time_travel.push_state(self._state.to_dict(), {"type": "@@INIT"})
+                self._time_travel.push_state(self._state, {"type": "@@INIT"})
 
     def disable_debug(self):
         """Disable time travel debugging."""
         with self._lock:
             if self._debug_mode:
                 self._debug_mode = False
-                latest_state = self._time_travel.get_state(len(self._time_travel.history) - 1)
-                if latest_state:
-                    self._state = ImmutableDict(latest_state)
+                latest_state = self._time_travel.get_state(len(self._time_travel) - 1)
+                if latest_state is not None:
+                    self._state = latest_state
                     self._persist_state()
 
     def time_travel_to(self, index: int):
@@ -212,7 +389,10 @@ class beanstackStore:
             state = self._time_travel.get_state(index)
             if state is not None:
                 self._time_travel.current_index = index
-                self._notify_subscribers()
+
+        # Like dispatch, subscribers are called after the lock is released
+        if state is not None:
+            self._notify_subscribers()
 
     def get_history(self) -> List[Dict]:
         """Get the action history for debugging."""
@@ -224,13 +404,17 @@ class beanstackStore:
     def remove_persisted_slice(self, slice_key: str) -> None:
         """Clear the persisted state from storage."""
         if self._storage:
-            self._storage.remove(self._storage_key, slice_key)
+            with self._persist_lock:
+                self._storage.remove(self._storage_key, slice_key)
+                self._last_persisted = None
 
 
     def clear_persisted_state(self) -> None:
         """Clear the persisted state from storage."""
         if self._storage:
-            self._storage.clear(self._storage_key)
+            with self._persist_lock:
+                self._storage.clear(self._storage_key)
+                self._last_persisted = None
 
 
 def combine_reducers(reducers: Dict[str, Callable]) -> Callable:
@@ -252,16 +436,46 @@ def combine_reducers(reducers: Dict[str, Callable]) -> Callable:
         else:
             registered_reducers[key] = reducer
 
-    def combined_reducer(state: Dict[str, Any] = None, action: Dict[str, Any] = None) -> Dict[str, Any]:
-        if state is None:
-            state = {}
-        
-        next_state = {
-            key: reducer(state.get(key), action)
-            for key, reducer in registered_reducers.items()
-        }
-        return ImmutableDict(next_state)
-    return combined_reducer
+    return _compile_combined_reducer(registered_reducers)
+
+
+def _compile_combined_reducer(registered_reducers: Dict[str, Callable]) -> Callable:
+    """
+    Generate a combined reducer specialised for the given slices.
+
+    Keys and reducers are bound as closure variables of a generated factory,
+    so the body runs as straight-line cell loads instead of iterating the
+    registry on every dispatch, and the reducer's signature stays
+    `(state, action)`. When the incoming state is a read-only FrozenDict view
+    and every slice reducer returns the slice it was given, that state is
+    returned unchanged so the store can skip the update. A mutable state may
+    have been edited in place, so it always gets a new dict.
+    """
+    count = len(registered_reducers)
+    bound = "".join(f", _k{i}, _r{i}" for i in range(count))
+    lines = [
+        f"def make_combined_reducer(FrozenDict{bound}):",
+        "    def combined_reducer(state=None, action=None):",
+        "        if state is None:",
+        "            state = {}",
+        "        _get = state.get",
+    ]
+    for i in range(count):
+        lines.append(f"        _o{i} = _get(_k{i})")
+        lines.append(f"        _v{i} = _r{i}(_o{i}, action)")
+    unchanged = ["isinstance(state, FrozenDict)"]
+    unchanged.extend(f"_v{i} is _o{i}" for i in range(count))
+    unchanged.append(f"len(state) == {count}")
+    lines.append(f"        if {' and '.join(unchanged)}:")
+    lines.append("            return state")
+    # Return a plain dict; the store wraps the result in an ImmutableDict once
+    lines.append("        return {" + ", ".join(f"_k{i}: _v{i}" for i in range(count)) + "}")
+    lines.append("    return combined_reducer")
+
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    args = [item for pair in registered_reducers.items() for item in pair]
+    return namespace["make_combined_reducer"](FrozenDict, *args)
 
 
 # Store creator function
@@ -59,8 +59,11 @@ def apply_middleware(*middlewares):
             chain = [middleware(store_api) for middleware in reversed(middlewares)]
             dispatch = reduce(lambda acc, curr: curr(acc), chain, store.dispatch)
 
-            # Final enhanced dispatch assigned back to the store
+            # Final enhanced dispatch assigned back to the store. Middleware that
+            # dispatches at call time now reaches it directly, without the
+            # forwarding lambda that was only needed during composition.
             store.dispatch = dispatch
+            store_api.dispatch = dispatch
 
             # Dispatch @@INIT after middleware setup
             store.dispatch({"type": ActionTypes.INIT})
@@ -1,8 +1,16 @@
-from typing import Any, Optional, Protocol
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Protocol
 import json
+import logging
 import os
+import queue
+import threading
+import weakref
 
 from .runtime import is_server_side
+from .types import FrozenDict, FrozenList
+
+logger = logging.getLogger(__name__)
 
 if is_server_side:
     session_storage = None
@@ -19,15 +27,35 @@ class StorageEngine(Protocol):
     def clear(self, key: str) -> None: ...
 
 class FileStorage:
-    """File-based storage engine implementation."""
-    def __init__(self, directory: str = ".store"):
+    """
+    File-based storage engine implementation.
+
+    Writes go to a temporary file that atomically replaces the target, so a
+    crash never leaves a truncated state file behind. Set `durable=True` to
+    also fsync each write before it replaces the previous file.
+    """
+    def __init__(self, directory: str = ".store", durable: bool = False):
         self.directory = directory
+        self.durable = durable
         os.makedirs(directory, exist_ok=True)
     
     def save(self, key: str, data: Any) -> None:
         path = os.path.join(self.directory, f"{key}.json")
-        with open(path, 'w') as f:
-            json.dump(data, f)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Never leave a partial temp file behind
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
     
     def load(self, key: str) -> Optional[Any]:
         path = os.path.join(self.directory, f"{key}.json")
@@ -47,20 +75,175 @@ class FileStorage:
         except FileNotFoundError:
             pass
 
+class _AsyncWriter:
+    """
+    The pending writes and background thread behind an AsyncFileStorage.
+
+    Kept apart from AsyncFileStorage so that neither the thread nor the exit
+    hook holds on to the storage object itself.
+    """
+    def __init__(self, file_storage: FileStorage, coalesce_ms: int):
+        self.file_storage = file_storage
+        self.coalesce_ms = coalesce_ms
+        self._pending: Dict[str, Any] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        # Single wake-up slot: one queued signal covers any number of saves
+        self._wakeup = queue.Queue(maxsize=1)
+        self._worker = threading.Thread(target=self._run, name="beanstack-persist", daemon=True)
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.get()
+            if self._closed.is_set():
+                return
+            # Wait out the coalesce window, but wake up early when closing
+            self._closed.wait(self.coalesce_ms / 1000)
+            self.flush()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            for key, data in pending.items():
+                try:
+                    self.file_storage.save(key, data)
+                except Exception:
+                    logger.exception("Error persisting state '%s'", key)
+                    with self._pending_lock:
+                        # Keep it for the next write unless a newer value arrived
+                        self._pending.setdefault(key, data)
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wakeup.put(None)
+        # The garbage collector may run this on the worker thread itself
+        if threading.current_thread() is not self._worker:
+            self._worker.join()
+        self.flush()
+
+    def save(self, key: str, data: Any) -> None:
+        with self._pending_lock:
+            self._pending[key] = data
+        if self._closed.is_set():
+            # No worker any more: write through instead
+            self.flush()
+            return
+        try:
+            self._wakeup.put_nowait(None)
+        except queue.Full:
+            pass  # The worker is already due to write
+
+    def load(self, key: str) -> Optional[Any]:
+        with self._pending_lock:
+            if key in self._pending:
+                return self._pending[key]
+        return self.file_storage.load(key)
+
+    def clear(self, key: str) -> None:
+        with self._write_lock:
+            with self._pending_lock:
+                self._pending.pop(key, None)
+            self.file_storage.clear(key)
+
+class AsyncFileStorage:
+    """
+    File-based storage engine that persists from a background thread.
+
+    `save` only records the latest value for a key and returns immediately;
+    a daemon thread waits `coalesce_ms` after being woken and then writes
+    whatever is pending through FileStorage, so a burst of dispatches costs a
+    single write per key.
+
+    A key whose write fails is logged and stays pending, so it is retried on
+    the next write unless a newer value replaces it. Call `close()` to stop
+    the worker once the storage is no longer needed; otherwise that happens
+    when the storage is garbage collected or the interpreter exits, and
+    anything still pending is written first.
+    """
+    def __init__(self, directory: str = ".store", coalesce_ms: int = 50, durable: bool = False):
+        self._file_storage = FileStorage(directory, durable=durable)
+        self.directory = self._file_storage.directory
+        self._writer = _AsyncWriter(self._file_storage, coalesce_ms)
+        # Also runs at interpreter exit, without keeping this object alive
+        self._finalizer = weakref.finalize(self, self._writer.close)
+
+    @property
+    def coalesce_ms(self) -> int:
+        return self._writer.coalesce_ms
+
+    @coalesce_ms.setter
+    def coalesce_ms(self, value: int) -> None:
+        self._writer.coalesce_ms = value
+
+    def flush(self) -> None:
+        """Write all pending states to disk now."""
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Stop the background writer after writing anything still pending."""
+        self._finalizer()
+
+    def save(self, key: str, data: Any) -> None:
+        self._writer.save(key, data)
+
+    def load(self, key: str) -> Optional[Any]:
+        return self._writer.load(key)
+
+    def remove(self, key: str, attr_key: str) -> None:
+        self._file_storage.remove(key, attr_key)
+
+    def clear(self, key: str) -> None:
+        self._writer.clear(key)
+
+_LEAF_TYPES = (str, int, float, type(None), FrozenDict, FrozenList)
+
+
+def _freeze(value: Any) -> Any:
+    """Return `value` as read-only FrozenDict/FrozenList views, reusing frozen parts."""
+    # Leaves and already frozen views are by far the common case, so they
+    # are checked first and returned as they are.
+    if isinstance(value, _LEAF_TYPES):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList([_freeze(item) for item in value])
+    return value
+
+
 class MemoryStorage:
-    """In-memory storage engine implementation."""
-    def __init__(self):
+    """
+    In-memory storage engine implementation.
+
+    Data is kept as read-only FrozenDict/FrozenList views, so neither the
+    caller nor the store can change what was saved. The store already saves
+    its read-only view, which is kept as it is; other mutable input is frozen
+    on save. `load` hands the views back without copying; use `dict(...)` or
+    `copy.deepcopy` for a copy that can be modified. Pass `serialize=True` to
+    store JSON strings instead, matching what BrowserStorage would round-trip.
+    """
+    def __init__(self, serialize: bool = False):
         self._storage = {}
+        self.serialize = serialize
     
     def save(self, key: str, data: Any) -> None:
-        self._storage[key] = json.dumps(data)
+        if self.serialize:
+            self._storage[key] = json.dumps(data)
+        else:
+            self._storage[key] = _freeze(data)
     
     def load(self, key: str) -> Optional[Any]:
-        
-        if key in self._storage:
-            print(f"load: {json.loads(self._storage[key])}")
-            return json.loads(self._storage[key])
-        return None
+        data = self._storage.get(key)
+        if data is None:
+            return None
+        if self.serialize:
+            return json.loads(data)
+        return data
     
     def remove(self, key: str, attr_key: str) -> None:
         pass
@@ -104,7 +287,6 @@ class BrowserStorage:
 
         if value_json:
             data = json.loads(value_json)
-            print(f"load: {data}")
             if data is not None:
                 return data
             
@@ -124,5 +306,6 @@ class BrowserStorage:
         self._storage.removeItem(key)
 
 
-session_storage = BrowserStorage(sessionStorage, "session_storage")
-local_storage = BrowserStorage(localStorage, "local_storage")
\ No newline at end of file
+if not is_server_side:
+    session_storage = BrowserStorage(sessionStorage, "session_storage")
+    local_storage = BrowserStorage(localStorage, "local_storage")
@@ -1,18 +1,93 @@
+import copy
 from collections.abc import Mapping
 
 class ActionTypes(object):
     INIT = '@@pyredux/INIT'
 
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+
+class FrozenDict(dict):
+    """
+    A read-only dict, used for the shared plain views of an ImmutableDict.
+
+    Copies (`dict(view)`, `copy.copy`, `copy.deepcopy`, pickling) are plain,
+    mutable dicts.
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """
+    A read-only list, used for the shared plain views of an ImmutableList.
+
+    Concatenation and copies produce plain, mutable lists.
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
 class ImmutableDict:
     """
     A simple immutable dictionary implementation.
+
+    When `base` is given, any value in `data` that is still the cached
+    read-only view of one of `base`'s subtrees reuses that subtree instead of
+    wrapping it again, so only the changed branches are rebuilt.
     """
-    def __init__(self, data=None):
+    def __init__(self, data=None, base=None):
         self._data = {}
+        self._view_cache = None
+        self._selector_cache = None
+        self._hash = None
         if data:
+            base_data = base._data if base is not None else {}
             for key, value in data.items():
+                if isinstance(value, (ImmutableDict, ImmutableList)):
+                    self._data[key] = value
+                    continue
+
+                # A view that was never built is None, which must not match
+                previous = base_data.get(key)
+                if isinstance(previous, ImmutableDict):
+                    if previous._view_cache is not None and value is previous._view_cache:
+                        self._data[key] = previous
+                        continue
+                elif isinstance(previous, ImmutableList):
+                    if previous._view_cache is not None and value is previous._view_cache:
+                        self._data[key] = previous
+                        continue
+                    previous = None
+                else:
+                    previous = None
+
                 if isinstance(value, Mapping):
-                    self._data[key] = ImmutableDict(value)
+                    self._data[key] = ImmutableDict(value, previous)
                 elif isinstance(value, list):
                     self._data[key] = ImmutableList(value)
                 else:
@@ -27,6 +102,9 @@ class ImmutableDict:
     def __iter__(self):
         return iter(self._data)
 
+    def __len__(self):
+        return len(self._data)
+
     def get(self, key, default=None):
         return self._data.get(key, default)
 
@@ -43,6 +121,20 @@ class ImmutableDict:
                 result[key] = value
         return result
 
+    def view(self):
+        """
+        Return a read-only FrozenDict view of the ImmutableDict.
+
+        The view is built once and shared, which is safe because it cannot be
+        modified; use `to_dict()` for a copy that can.
+        """
+        if self._view_cache is None:
+            self._view_cache = FrozenDict(
+                (key, value.view() if isinstance(value, (ImmutableDict, ImmutableList)) else value)
+                for key, value in self._data.items()
+            )
+        return self._view_cache
+
     def __repr__(self):
         """Provide a string representation of the ImmutableDict."""
         return f"ImmutableDict({repr(self._data)})"
@@ -55,7 +147,9 @@ class ImmutableDict:
 
     def __hash__(self):
         """Compute a hash value for the ImmutableDict."""
-        return hash(frozenset(self._data.items()))
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
 
 
 class ImmutableList:
@@ -64,9 +158,13 @@ class ImmutableList:
     """
     def __init__(self, data=None):
         self._data = []
+        self._view_cache = None
+        self._hash = None
         if data:
             for item in data:
-                if isinstance(item, Mapping):
+                if isinstance(item, (ImmutableDict, ImmutableList)):
+                    self._data.append(item)
+                elif isinstance(item, Mapping):
                     self._data.append(ImmutableDict(item))
                 elif isinstance(item, list):
                     self._data.append(ImmutableList(item))
@@ -92,6 +190,20 @@ class ImmutableList:
                 result.append(item)
         return result
 
+    def view(self):
+        """
+        Return a read-only FrozenList view of the ImmutableList.
+
+        The view is built once and shared; use `to_list()` for a copy that
+        can be modified.
+        """
+        if self._view_cache is None:
+            self._view_cache = FrozenList(
+                item.view() if isinstance(item, (ImmutableDict, ImmutableList)) else item
+                for item in self._data
+            )
+        return self._view_cache
+
     def __repr__(self):
         """Provide a string representation of the ImmutableList."""
         return f"ImmutableList({repr(self._data)})"
@@ -104,4 +216,6 @@ class ImmutableList:
 
     def __hash__(self):
         """Compute a hash value for the ImmutableList."""
-        return hash(tuple(self._data))
+        if self._hash is None:
+            self._hash = hash(tuple(self._data))
+        return self._hash
@@ -1,29 +1,64 @@
 from collections.abc import Mapping
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+
+class _MergeNode:
+    """A level of the state being merged, copied only once it has to change."""
+    __slots__ = ("source", "copy", "parent", "key")
+
+    def __init__(self, source: Mapping, parent: Optional["_MergeNode"] = None, key: Any = None):
+        self.source = source
+        self.copy = None
+        self.parent = parent
+        self.key = key
+
+    def writable(self) -> Dict[Any, Any]:
+        """Return this level's copy, copying it and any uncopied ancestors first."""
+        if self.copy is None:
+            self.copy = dict(self.source)
+            child, node = self.copy, self
+            while node.parent is not None:
+                parent = node.parent
+                if parent.copy is not None:
+                    parent.copy[node.key] = child
+                    break
+                parent.copy = dict(parent.source)
+                parent.copy[node.key] = child
+                child, node = parent.copy, parent
+        return self.copy
+
 
-    
 def combine_state(initial_state: Dict[Any, Any], stored_state: Dict[Any, Any]) -> Dict[Any, Any]:
 
     """
     Match stored state to state of store, merging nested dictionaries.
-    
+
+    Levels are only copied when the stored state differs from them, so when
+    nothing differs `initial_state` itself is returned.
+
     Args:
         initial_state: The initial state dictionary
         stored_state: The stored state dictionary to merge
     Returns:
         Merged state dictionary
     """
-    # Create a shallow copy of initial_state
-    merged_state = dict(initial_state)
-    
-    for key, stored_value in stored_state.items():
-        if key not in merged_state:
-            merged_state[key] = stored_value
-        else:
-            initial_value = merged_state[key]
+    root = _MergeNode(initial_state)
+    stack = [(root, stored_state)]
+
+    while stack:
+        node, stored = stack.pop()
+        current = node.source
+        for key, stored_value in stored.items():
+            if key not in current:
+                node.writable()[key] = stored_value
+                continue
+
+            initial_value = current[key]
+            if initial_value is stored_value:
+                continue
             if isinstance(initial_value, Mapping) and isinstance(stored_value, Mapping):
-                merged_state[key] = combine_state(initial_value, stored_value)
+                stack.append((_MergeNode(initial_value, node, key), stored_value))
             elif initial_value != stored_value:
-                merged_state[key] = stored_value
-    
-    return merged_state
\ No newline at end of file
+                node.writable()[key] = stored_value
+
+    return root.copy if root.copy is not None else initial_state
@@ -0,0 +1,190 @@
+import gc
+import logging
+import os
+import threading
+import time
+import weakref
+
+from beanstack import AsyncFileStorage, FileStorage, MemoryStorage, combine_reducers, create_store
+
+
+def counter(state=None, action=None):
+    if state is None:
+        state = {"count": 0}
+    if action["type"] == "INCREMENT":
+        return {**state, "count": state["count"] + 1}
+    return state
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_async_storage_coalesces_writes(tmp_path, monkeypatch):
+    storage = AsyncFileStorage(str(tmp_path), coalesce_ms=50)
+    writes = []
+    save = storage._file_storage.save
+    monkeypatch.setattr(storage._file_storage, "save", lambda key, data: (writes.append(data), save(key, data)))
+
+    store = create_store(combine_reducers({"counter": counter}), storage_engine=storage)
+    for _ in range(100):
+        store.dispatch({"type": "INCREMENT"})
+
+    assert wait_for(lambda: FileStorage(str(tmp_path)).load("beanstack_state") == {"counter": {"count": 100}})
+    assert len(writes) < 100
+    storage.close()
+
+
+def test_async_storage_flush_and_pending_load(tmp_path):
+    storage = AsyncFileStorage(str(tmp_path), coalesce_ms=10_000)
+    storage.save("key", {"a": 1})
+
+    # Pending values are visible before they reach the disk
+    assert storage.load("key") == {"a": 1}
+    assert not os.path.exists(tmp_path / "key.json")
+
+    storage.flush()
+    assert FileStorage(str(tmp_path)).load("key") == {"a": 1}
+    storage.close()
+
+
+def test_async_storage_survives_failed_write(tmp_path):
+    storage = AsyncFileStorage(str(tmp_path), coalesce_ms=10)
+    storage.save("key", {"bad": object()})
+    assert wait_for(lambda: not storage._writer._wakeup.qsize())
+    storage.flush()
+    assert storage._writer._worker.is_alive()
+
+    storage.save("key", {"good": 1})
+    assert wait_for(lambda: FileStorage(str(tmp_path)).load("key") == {"good": 1})
+    assert os.listdir(tmp_path) == ["key.json"]
+    storage.close()
+
+
+def test_async_storage_close_stops_worker_and_writes_pending(tmp_path):
+    threads = threading.active_count()
+    storage = AsyncFileStorage(str(tmp_path), coalesce_ms=10_000)
+    storage.save("key", {"a": 1})
+    storage.close()
+
+    assert not storage._writer._worker.is_alive()
+    assert threading.active_count() == threads
+    assert FileStorage(str(tmp_path)).load("key") == {"a": 1}
+
+    # After close, saves are written straight through
+    storage.save("key", {"a": 2})
+    assert FileStorage(str(tmp_path)).load("key") == {"a": 2}
+
+
+def test_async_storage_logs_failed_write(tmp_path, caplog):
+    storage = AsyncFileStorage(str(tmp_path), coalesce_ms=10_000)
+    storage.save("key", {"bad": object()})
+
+    with caplog.at_level(logging.ERROR, logger="beanstack.storage"):
+        storage.flush()
+
+    assert "Error persisting state 'key'" in caplog.text
+    storage._writer._pending.clear()
+    storage.close()
+
+
+def test_async_storage_dropped_instance_is_collected(tmp_path):
+    storage = AsyncFileStorage(str(tmp_path), coalesce_ms=10_000)
+    storage.save("key", {"a": 1})
+    ref = weakref.ref(storage)
+    worker = storage._writer._worker
+
+    del storage
+    gc.collect()
+
+    assert ref() is None
+    assert not worker.is_alive()
+    assert FileStorage(str(tmp_path)).load("key") == {"a": 1}
+
+
+def test_file_storage_durable_write_calls_fsync(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+
+    FileStorage(str(tmp_path)).save("key", {"a": 1})
+    assert synced == []
+
+    storage = FileStorage(str(tmp_path), durable=True)
+    storage.save("key", {"a": 2})
+    assert len(synced) == 1
+    assert storage.load("key") == {"a": 2}
+
+
+def test_file_storage_failed_write_keeps_previous_file(tmp_path):
+    storage = FileStorage(str(tmp_path))
+    storage.save("key", {"a": 1})
+
+    try:
+        storage.save("key", {"a": object()})
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("unserializable data should raise")
+
+    assert os.listdir(tmp_path) == ["key.json"]
+    assert storage.load("key") == {"a": 1}
+
+
+def test_memory_storage_is_isolated_from_the_store():
+    storage = MemoryStorage()
+    store = create_store(combine_reducers({"counter": counter}), storage_engine=storage)
+    store.dispatch({"type": "INCREMENT"})
+
+    loaded = storage.load("beanstack_state")
+    assert loaded == {"counter": {"count": 1}}
+    try:
+        loaded["counter"]["count"] = 999
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("loaded state should be read-only")
+
+    assert store.get_state() == {"counter": {"count": 1}}
+    assert storage.load("beanstack_state") == {"counter": {"count": 1}}
+
+
+def test_memory_storage_freezes_mutable_input_and_keeps_frozen_input():
+    storage = MemoryStorage()
+    data = {"a": {"b": [1, 2]}}
+    storage.save("plain", data)
+    data["a"]["b"].append(3)
+
+    assert storage.load("plain") == {"a": {"b": [1, 2]}}
+    try:
+        storage.load("plain")["a"]["b"].append(3)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("loaded data should be read-only")
+
+    store = create_store(combine_reducers({"counter": counter}), storage_engine=storage)
+    store.dispatch({"type": "INCREMENT"})
+    assert storage.load("beanstack_state") is store._state.view()
+
+
+def test_memory_storage_serialize_round_trips_json():
+    storage = MemoryStorage(serialize=True)
+    storage.save("key", {"a": [1, 2]})
+
+    assert storage._storage["key"] == '{"a": [1, 2]}'
+    assert storage.load("key") == {"a": [1, 2]}
+    assert storage.load("missing") is None
+
+
+def test_memory_storage_rehydrates_a_new_store():
+    storage = MemoryStorage()
+    store = create_store(combine_reducers({"counter": counter}), storage_engine=storage)
+    store.dispatch({"type": "INCREMENT"})
+
+    rehydrated = create_store(combine_reducers({"counter": counter}), storage_engine=storage)
+    assert rehydrated.get_state() == {"counter": {"count": 1}}
@@ -0,0 +1,371 @@
+import gc
+import threading
+from datetime import datetime
+
+from beanstack import ImmutableDict, MemoryStorage, combine_reducers, create_store
+from beanstack.beanstack_store import TimeTravel
+from beanstack.utils import combine_state
+
+
+def counter(state=None, action=None):
+    if state is None:
+        state = {"count": 0}
+    if action["type"] == "INCREMENT":
+        return {**state, "count": state["count"] + 1}
+    return state
+
+
+def todos(state=None, action=None):
+    if state is None:
+        state = []
+    if action["type"] == "ADD_TODO":
+        return state + [action["payload"]]
+    return state
+
+
+def make_store():
+    store = create_store(combine_reducers({"counter": counter, "todos": todos}))
+    store.dispatch({"type": "@@INIT"})
+    return store
+
+
+def subscribe_counter(store):
+    calls = []
+    store.subscribe(lambda: calls.append(store.get_state()))
+    return calls
+
+
+def test_dispatch_notifies_subscribers():
+    store = make_store()
+    calls = subscribe_counter(store)
+
+    store.dispatch({"type": "INCREMENT"})
+
+    assert store.get_state()["counter"] == {"count": 1}
+    assert len(calls) == 1
+
+
+def test_unhandled_action_skips_notification():
+    store = make_store()
+    calls = subscribe_counter(store)
+
+    store.dispatch({"type": "UNKNOWN"})
+
+    assert calls == []
+    assert store.get_state() == {"counter": {"count": 0}, "todos": []}
+
+
+def test_equal_but_different_state_is_still_stored():
+    def flag(state=None, action=None):
+        if state is None:
+            state = 1
+        if action["type"] == "SET":
+            return action["payload"]
+        return state
+
+    store = create_store(combine_reducers({"flag": flag}))
+    store.dispatch({"type": "@@INIT"})
+    calls = subscribe_counter(store)
+
+    store.dispatch({"type": "SET", "payload": True})
+
+    assert store.get_state("flag") is True
+    assert calls == []
+
+
+def test_batch_notifies_once_after_outermost_exit():
+    store = make_store()
+    calls = subscribe_counter(store)
+
+    with store.batch():
+        store.dispatch({"type": "INCREMENT"})
+        with store.batch():
+            store.dispatch({"type": "INCREMENT"})
+            store.dispatch({"type": "ADD_TODO", "payload": "write tests"})
+        assert calls == []
+        store.dispatch({"type": "INCREMENT"})
+        assert calls == []
+
+    assert len(calls) == 1
+    assert calls[0] == {"counter": {"count": 3}, "todos": ["write tests"]}
+
+
+def test_batch_without_changes_does_not_notify():
+    store = make_store()
+    calls = subscribe_counter(store)
+
+    with store.batch():
+        store.dispatch({"type": "UNKNOWN"})
+        store.dispatch({"type": "UNKNOWN"})
+
+    assert calls == []
+
+
+def test_batch_flushes_when_body_raises():
+    store = make_store()
+    calls = subscribe_counter(store)
+
+    try:
+        with store.batch():
+            store.dispatch({"type": "INCREMENT"})
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert len(calls) == 1
+    store.dispatch({"type": "INCREMENT"})
+    assert len(calls) == 2
+
+
+def test_batch_does_not_hold_back_other_threads():
+    store = make_store()
+    calls = subscribe_counter(store)
+
+    with store.batch():
+        store.dispatch({"type": "INCREMENT"})
+        worker = threading.Thread(target=store.dispatch, args=({"type": "ADD_TODO", "payload": "other thread"},))
+        worker.start()
+        worker.join()
+        assert len(calls) == 1
+
+    assert len(calls) == 2
+    assert calls[-1] == {"counter": {"count": 1}, "todos": ["other thread"]}
+
+
+def test_reducer_cannot_mutate_its_input():
+    def mutating(state=None, action=None):
+        if state is None:
+            state = {"count": 0}
+        if action["type"] == "INCREMENT":
+            state["count"] += 1
+        return state
+
+    store = create_store(combine_reducers({"counter": mutating}))
+    store.dispatch({"type": "@@INIT"})
+
+    try:
+        store.dispatch({"type": "INCREMENT"})
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("in-place edit of the reducer input should fail")
+
+    assert store.get_state() == {"counter": {"count": 0}}
+    assert store.get_state("counter")["count"] == 0
+
+
+def test_get_state_returns_a_private_copy():
+    store = make_store()
+    state = store.get_state()
+    state["counter"]["count"] = 999
+
+    assert store.get_state()["counter"] == {"count": 0}
+
+
+def test_select_memoizes_until_state_changes():
+    store = make_store()
+    calls = []
+
+    def select_count(state):
+        calls.append(state)
+        return state["counter"]["count"] * 10
+
+    assert store.select(select_count) == 0
+    assert store.select(select_count) == 0
+    assert len(calls) == 1
+
+    store.dispatch({"type": "UNKNOWN"})
+    assert store.select(select_count) == 0
+    assert len(calls) == 1
+
+    store.dispatch({"type": "INCREMENT"})
+    assert store.select(select_count) == 10
+    assert len(calls) == 2
+
+
+def test_select_does_not_keep_dropped_selectors_alive():
+    store = make_store()
+    gc.collect()
+
+    for _ in range(3):
+        assert store.select(lambda state: state["counter"]["count"]) == 0
+    gc.collect()
+
+    assert len(store._state._selector_cache) == 0
+    assert store.select(len) == 2
+
+
+def test_select_follows_time_travel():
+    store = make_store()
+    store.enable_debug()
+    store.dispatch({"type": "INCREMENT"})
+
+    def select_count(state):
+        return state["counter"]["count"]
+
+    assert store.select(select_count) == 1
+    store.time_travel_to(0)
+    assert store.select(select_count) == 0
+
+
+def test_time_travel_notifies_outside_the_lock():
+    store = make_store()
+    store.enable_debug()
+    store.dispatch({"type": "INCREMENT"})
+    seen = []
+
+    def listener():
+        # Another thread can only dispatch if the lock is free
+        worker = threading.Thread(target=store.dispatch, args=({"type": "UNKNOWN"},))
+        worker.start()
+        worker.join(timeout=1)
+        seen.append(worker.is_alive())
+
+    store.subscribe(listener)
+    store.time_travel_to(0)
+
+    assert seen == [False]
+
+
+class RecordingStorage(MemoryStorage):
+    def __init__(self, failures=0):
+        super().__init__()
+        self.saves = []
+        self.failures = failures
+
+    def save(self, key, data):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.saves.append(data)
+        super().save(key, data)
+
+
+def make_persisted_store(storage):
+    store = create_store(
+        combine_reducers({"counter": counter, "todos": todos}),
+        storage_engine=storage,
+        persist_keys=["counter"],
+    )
+    store.dispatch({"type": "@@INIT"})
+    return store
+
+
+def test_time_travel_wraps_around_at_max_history():
+    history = TimeTravel(max_history=3)
+    for i in range(5):
+        history.push_state({"n": i}, {"type": f"A{i}"})
+
+    assert len(history) == 3
+    assert [history.get_state(i)["n"] for i in range(3)] == [2, 3, 4]
+    assert history.get_state(3) is None
+    assert history.get_current_state()["n"] == 4
+
+
+def test_time_travel_drops_undone_branch():
+    history = TimeTravel(max_history=5)
+    for i in range(3):
+        history.push_state({"n": i}, {"type": f"A{i}"})
+
+    history.current_index = 0
+    history.push_state({"n": 9}, {"type": "B"})
+
+    assert len(history) == 2
+    assert [entry["action"]["type"] for entry in history.get_history()] == ["A0", "B"]
+    assert history.get_current_state()["n"] == 9
+
+
+def test_time_travel_with_no_history():
+    history = TimeTravel(max_history=0)
+    history.push_state({"n": 1}, {"type": "A"})
+
+    assert len(history) == 0
+    assert history.get_current_state() is None
+    assert history.get_history() == []
+
+
+def test_get_history_lists_actions_in_order():
+    store = make_store()
+    store.enable_debug()
+    action = {"type": "INCREMENT"}
+    store.dispatch(action)
+    store.time_travel_to(0)
+
+    history = store.get_history()
+
+    assert [entry["index"] for entry in history] == [0, 1]
+    assert [entry["action"] for entry in history] == [{"type": "@@INIT"}, {"type": "INCREMENT"}]
+    assert history[1]["action"] is not action
+    assert [entry["active"] for entry in history] == [True, False]
+    for entry in history:
+        datetime.fromisoformat(entry["timestamp"])
+
+
+def test_combine_state_copies_only_what_differs():
+    initial = {"a": {"x": 1, "y": {"z": 2}}, "b": {"c": 3}}
+
+    assert combine_state(initial, {"a": {"x": 1}, "b": {"c": 3}}) is initial
+
+    merged = combine_state(initial, {"a": {"y": {"z": 5}}, "d": 4})
+
+    assert merged == {"a": {"x": 1, "y": {"z": 5}}, "b": {"c": 3}, "d": 4}
+    assert initial == {"a": {"x": 1, "y": {"z": 2}}, "b": {"c": 3}}
+    assert merged["b"] is initial["b"]
+
+
+def test_combined_reducer_returns_its_input_only_when_unchanged():
+    reducer = combine_reducers({"counter": counter, "todos": todos})
+    state = ImmutableDict(reducer({}, {"type": "@@INIT"})).view()
+
+    assert reducer(state, {"type": "UNKNOWN"}) is state
+
+    changed = reducer(state, {"type": "INCREMENT"})
+    assert changed is not state
+    assert changed == {"counter": {"count": 1}, "todos": []}
+    assert changed["todos"] is state["todos"]
+
+    plain = {"counter": {"count": 0}, "todos": []}
+    assert reducer(plain, {"type": "UNKNOWN"}) is not plain
+
+
+def test_persist_skips_untouched_slices():
+    storage = RecordingStorage()
+    store = make_persisted_store(storage)
+    saves = len(storage.saves)
+
+    store.dispatch({"type": "ADD_TODO", "payload": "not persisted"})
+    assert len(storage.saves) == saves
+
+    store.dispatch({"type": "INCREMENT"})
+    assert len(storage.saves) == saves + 1
+    assert storage.saves[-1] == {"counter": {"count": 1}}
+
+
+def test_persist_retries_after_failed_save():
+    storage = RecordingStorage()
+    store = make_persisted_store(storage)
+    storage.failures = 1
+
+    try:
+        store.dispatch({"type": "INCREMENT"})
+    except OSError:
+        pass
+    else:
+        raise AssertionError("the failed save should propagate")
+
+    # The counter slice is unchanged, but it never reached storage
+    store.dispatch({"type": "ADD_TODO", "payload": "retry"})
+    assert storage.saves[-1] == {"counter": {"count": 1}}
+
+
+def test_persist_skips_a_superseded_state():
+    storage = RecordingStorage()
+    store = make_persisted_store(storage)
+    stale = store._state
+    store.dispatch({"type": "INCREMENT"})
+    saves = len(storage.saves)
+
+    store._persist_state(stale)
+
+    assert len(storage.saves) == saves
+    assert storage.load("beanstack_state") == {"counter": {"count": 1}}
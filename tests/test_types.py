@@ -0,0 +1,19 @@
+from beanstack import ImmutableDict
+
+
+def test_base_reuses_subtrees_whose_view_is_passed_back():
+    base = ImmutableDict({"a": {"x": 1}, "b": {"y": 2}})
+    view = base.view()
+
+    updated = ImmutableDict({"a": view["a"], "b": {"y": 3}}, base)
+
+    assert updated["a"] is base["a"]
+    assert updated.to_dict() == {"a": {"x": 1}, "b": {"y": 3}}
+
+
+def test_base_does_not_match_none_against_an_unbuilt_view():
+    base = ImmutableDict({"a": {"x": 1}, "l": [1, 2]})
+
+    updated = ImmutableDict({"a": None, "l": None}, base)
+
+    assert updated.to_dict() == {"a": None, "l": None}